@@ -1,34 +1,366 @@
 import argparse
-import openai
+import asyncio
+import hashlib
+import json
 import os
 import re
 import sys
-from dotenv import load_dotenv
+from functools import lru_cache
+
+_COMMON_PATTERNS = {
+    "email" : {
+        "pattern" : r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$",
+        "explanation" : "Matches standard email addresses with alphanumeric characters, dots, underscores, plus signs and hyphens.",
+        "examples" : ["user@example.com", "test.email+tag@domain.co.uk", "simple@test.org"]
+    },
+    "phone" : {
+        "pattern" : r"^\+?[1-9]\d{1,14}$",
+        "explanation" : "Matches international phone numbers with optional plus sign and 2-15 digits.",
+        "examples" : ["+1234567890", "1234567890", "+441234567890"]
+    },
+    "url" : {
+        "pattern" : r"^https?://[^\s]+$",
+        "explanation" : "Matches HTTP and HTTPS URLs.",
+        "examples" : ["https://example.com", "http://test.org/path", "https://sub.domain.com/page?query=value"]
+    },
+    "ip" : {
+        "pattern" : r"^(?:[0-9]{1,3}\.){3}[0-9]{1,3}$",
+        "explanation" : "Matches IPv4 addresses (basic format validation).",
+        "examples" : ["192.168.1.1", "10.0.0.1", "172.16.254.1"]
+    },
+    "date" : {
+        "pattern" : r"^(0[1-9]|1[0-2])/(0[1-9]|[12][0-9]|3[01])/\d{4}$",
+        "explanation" : "Matches dates in MM/DD/YYYY format.",
+        "examples" : ["01/15/2024", "12/31/2023", "06/08/1990"]
+    }
+}
+
+
+@lru_cache(maxsize=128)
+def _compile(pattern, flags=0):
+    """Compile a regex pattern, caching the result"""
+    return re.compile(pattern, flags)
+
+
+# The built-in patterns only describe ASCII text, so skip Unicode class tables.
+# Compiling them through _compile warms its cache at import time; _test_pattern
+# looks pattern strings up with the same flags (see _PATTERN_FLAGS) so it hits.
+for _info in _COMMON_PATTERNS.values():
+    _info["compiled"] = _compile(_info["pattern"], re.ASCII)
+
+# Flags a pattern string is compiled with, so a built-in pattern behaves the same
+# whichever entry point hands it to _test_pattern
+_PATTERN_FLAGS = {info["pattern"] : re.ASCII for info in _COMMON_PATTERNS.values()}
+
+_PATTERN_TRIGGERS = {
+    key : (key, f"{key} address", f"{key} addresses", f"{key} number", f"{key} numbers")
+    for key in _COMMON_PATTERNS
+}
+_TRIGGER_KEYS = {
+    phrase : key for key, triggers in _PATTERN_TRIGGERS.items() for phrase in triggers
+}
+
+# Lookahead so overlapping trigger phrases are all reported in one scan
+_TRIGGER_RE = re.compile(
+    "(?=(%s))" % "|".join(map(re.escape, sorted(_TRIGGER_KEYS, key=len, reverse=True)))
+)
+
+
+# One labelled field per line, e.g. "PATTERN: ^\d+$"
+_RESPONSE_RE = re.compile(r"^[ \t]*(PATTERN|EXPLANATION|EXAMPLES):[ \t]*(.*?)\s*$", re.M)
+
+# Static parts of the prompts, so only the descriptions are interpolated per call
+_PROMPT_REQUIREMENTS = """Requirements:
+- Must be accurate and handle common edge cases
+- Should be efficient (avoid catastrophic backtracking)
+- Use standard regex syntax that works across languages
+- Focus on practical, real-world usage
+"""
+
+_PROMPT_HEAD = "You are a regex expert. Generate a precise, production-ready regular expression for: \""
+
+_PROMPT_MID = "\"\n" + _PROMPT_REQUIREMENTS + r"""
+Respond in this EXACT format:
+PATTERN: [the regex pattern only]
+EXPLANATION: [clear explanation of what it matches]
+EXAMPLES: [3-5 realistic examples separated by |]
+
+Common reference patterns:
+- Email: ^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$
+- Phone: ^\+?[1-9]\d{1,14}$
+- URL: ^https?:\/\/[^\s]+$
+- IPv4: ^(?:[0-9]{1,3}\.){3}[0-9]{1,3}$
+- Date (MM/DD/YYYY): ^(0[1-9]|1[0-2])\/(0[1-9]|[12][0-9]|3[01])\/\d{4}$
+
+Generate for: """
+
+_BATCH_PROMPT_HEAD = (
+    "You are a regex expert. Generate a precise, production-ready regular expression "
+    "for each numbered description below.\n" + _PROMPT_REQUIREMENTS + """
+Respond with ONLY a JSON array containing one object per description, with these keys:
+- "index": the number of the description
+- "pattern": the regex pattern only
+- "explanation": clear explanation of what it matches
+- "examples": array of 3-5 realistic examples
+
+Descriptions:
+"""
+)
+
+# Regex components reported by --explain, in display order
+_FEATURES = [
+    ("^", "^ = Start of string"),
+    ("$", "$ = End of string"),
+    ("+", "+ = One or more of preceding element"),
+    ("*", "* = Zero or more of preceding element"),
+    ("?", "? = Zero or one of preceding element"),
+    ("[", "[] = Characters class (match any character inside)"),
+    ("\\d", "\\d = Any digit (0-9)"),
+    ("\\w", "\\w = Any word character (a-z, A-Z, 0-9, _)"),
+    ("\\s", "\\s = Any whitespace character"),
+]
+_FEATURE_BITS = {token : 1 << i for i, (token, _) in enumerate(_FEATURES) if len(token) == 1}
+_ESCAPE_FEATURE_BITS = {token[1] : 1 << i for i, (token, _) in enumerate(_FEATURES) if len(token) == 2}
+
+_CACHE_DIR = os.path.join(
+    os.getenv("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "regex-ai"
+)
+
+
+def _cache_path(prompt):
+    """Return the on-disk cache file for a prompt"""
+    key = hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()
+    return os.path.join(_CACHE_DIR, f"{key}.json")
+
+
+def _load_cached_result(prompt):
+    """Return the cached (pattern, explanation, examples) for a prompt, if any"""
+    try:
+        with open(_cache_path(prompt), encoding="utf-8") as f:
+            data = json.load(f)
+        return data["pattern"], data["explanation"], data["examples"]
+    except (OSError, ValueError, KeyError, TypeError):
+        return None
+
+
+def _store_cached_result(prompt, pattern, explanation, examples):
+    """Save a parsed AI result so repeated prompts skip the API call"""
+    # Never persist a broken pattern; rerunning should get a fresh answer
+    try:
+        _compile(pattern)
+    except re.error:
+        return
+
+    try:
+        os.makedirs(_CACHE_DIR, exist_ok=True)
+        with open(_cache_path(prompt), "w", encoding="utf-8") as f:
+            json.dump({"pattern" : pattern, "explanation" : explanation, "examples" : examples}, f)
+    except OSError:
+        pass
+
+
+def _write(lines):
+    """Write several output lines to stdout with a single call"""
+    if lines:
+        sys.stdout.write("\n".join(lines) + "\n")
+        sys.stdout.flush()
+
+
+_API_URL = "https://api.openai.com/v1/chat/completions"
+
+
+def _sse_delta(line):
+    """Return the reply text carried by one server-sent events line (empty if none)"""
+    if not line.startswith("data:"):
+        return ""
+    # The stream ends with "data: [DONE]"; keep reading past it so the body is fully
+    # consumed and the connection can go back to the keep-alive pool
+    data = line[len("data:"):].strip()
+    if data == "[DONE]":
+        return ""
+    choices = json.loads(data).get("choices")
+    if not choices:
+        return ""
+    return (choices[0].get("delta") or {}).get("content") or ""
+
+
+def _raise_api_error(response):
+    """Raise for a failed API response, preferring the API's own error message"""
+    try:
+        message = response.json()["error"]["message"]
+    except (ValueError, KeyError, TypeError):
+        message = None
+
+    if message:
+        raise RuntimeError(f"OpenAI API error ({response.status_code}): {message}")
+    response.raise_for_status()
+
+
+# Descriptions sent per request by generate_many (bounded by gpt-4's context window)
+_BATCH_SIZE = 10
+
 
 class RegexAI:
-    def __init__(self):
-        load_dotenv()
+    def __init__(self, use_cache=True):
+        # Heavy third-party imports are deferred so --help and common patterns start fast
+        if os.path.exists(".env"):
+            from dotenv import load_dotenv
+            load_dotenv(".env")
         self.api_key = os.getenv("OPENAI_API_KEY")
         if not self.api_key:
             print("Error: OPENAI_API_KEY not found in environment")
             print("Create a .env file with: OPENAI_API_KEY=your_key_here")
             sys.exit(1)
-        openai.api_key = self.api_key
+        self.use_cache = use_cache
+        self.client = None
+
+    def _get_client(self):
+        """Return the shared HTTP client, importing httpx on first use"""
+        if self.client is None:
+            import httpx
+            self.client = httpx.Client(headers=self._headers(), timeout=60)
+        return self.client
+
+    def close(self):
+        """Close the shared HTTP client and its pooled connections"""
+        if self.client is not None:
+            self.client.close()
+            self.client = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _new_async_client(self):
+        """Create an async HTTP client; it is bound to the running event loop"""
+        import httpx
+        return httpx.AsyncClient(headers=self._headers(), timeout=60)
+
+    def _headers(self):
+        """Headers for the chat completions endpoint"""
+        return {"Authorization" : f"Bearer {self.api_key}"}
+
+    def _payload(self, prompt, max_tokens=400, stream=False):
+        """Request body for the chat completions endpoint"""
+        payload = {
+            "model" : "gpt-4",
+            "messages" : [{"role" : "user", "content" : prompt}],
+            "max_tokens" : max_tokens,
+            "temperature" : 0.2
+        }
+        if stream:
+            payload["stream"] = True
+        return payload
+
+    def _complete(self, prompt, max_tokens=400):
+        """Send a chat completion request and return the reply text"""
+        response = self._get_client().post(_API_URL, json=self._payload(prompt, max_tokens))
+        if response.is_error:
+            _raise_api_error(response)
+        return response.json()["choices"][0]["message"]["content"]
+
+    def _stream_complete(self, prompt, max_tokens=400):
+        """Stream a chat completion, yielding reply text as it arrives"""
+        payload = self._payload(prompt, max_tokens, stream=True)
+        with self._get_client().stream("POST", _API_URL, json=payload) as response:
+            if response.is_error:
+                response.read()
+                _raise_api_error(response)
+            for line in response.iter_lines():
+                delta = _sse_delta(line)
+                if delta:
+                    yield delta
+
+    async def _stream_complete_async(self, prompt, max_tokens=400, client=None):
+        """Stream a chat completion without blocking the event loop"""
+        if client is None:
+            async with self._new_async_client() as client:
+                async for delta in self._stream_complete_async(prompt, max_tokens, client):
+                    yield delta
+            return
+
+        payload = self._payload(prompt, max_tokens, stream=True)
+        async with client.stream("POST", _API_URL, json=payload) as response:
+            if response.is_error:
+                await response.aread()
+                _raise_api_error(response)
+            async for line in response.aiter_lines():
+                delta = _sse_delta(line)
+                if delta:
+                    yield delta
 
     def generate(self, description, test_string=None, dry_run=False, explain=False):
         """Generate regex pattern from english description"""
-        common_pattern = self._check_common_patterns(description)
+        handled, result, prompt = self._resolve_locally(description, test_string, dry_run, explain, True)
+        if handled:
+            return result
+
+        print(f"Generating regex for: {description}")
+
+        try:
+            text = pattern = ""
+            for delta in self._stream_complete(prompt):
+                text, pattern = self._on_stream_delta(text, pattern, delta, test_string, True)
+            return self._finish_stream(prompt, text, pattern, test_string, explain, True)
+        except Exception as e:
+            print(f"Error generating regex: {e}")
+        return None
+
+    async def generate_all(self, descriptions, test_string=None, explain=False):
+        """Generate regex patterns for several descriptions concurrently"""
+        # Concurrent streams would interleave their output, so display afterwards
+        async with self._new_async_client() as client:
+            results = await asyncio.gather(*(
+                self.generate_async(description, display=False, client=client)
+                for description in descriptions
+            ))
+        self._display_results(descriptions, results, test_string, explain)
+        return results
+
+    async def generate_async(self, description, test_string=None, dry_run=False, explain=False,
+                             display=True, client=None):
+        """Generate regex pattern from english description without blocking the event loop"""
+        handled, result, prompt = self._resolve_locally(description, test_string, dry_run, explain, display)
+        if handled:
+            return result
+
+        if display:
+            print(f"Generating regex for: {description}")
+
+        try:
+            text = pattern = ""
+            async for delta in self._stream_complete_async(prompt, client=client):
+                text, pattern = self._on_stream_delta(text, pattern, delta, test_string, display)
+            return self._finish_stream(prompt, text, pattern, test_string, explain, display)
+        except Exception as e:
+            if display:
+                print(f"Error generating regex: {e}")
+            else:
+                print(f"Error generating regex for '{description}': {e}")
+        return None
+
+    def _resolve_locally(self, description, test_string, dry_run, explain, display):
+        """Answer from common patterns, --dry-run or the cache; returns (handled, result, prompt)"""
+        common_pattern = self._check_common_patterns(description.lower())
         if common_pattern and not dry_run:
-            self._display_result(
+            if display:
+                self._display_result(
+                    common_pattern["pattern"],
+                    common_pattern["explanation"],
+                    common_pattern["examples"]
+                )
+                print("\nFound in common patterns database!")
+
+                if test_string:
+                    self._test_pattern(common_pattern["compiled"], test_string)
+            result = (
                 common_pattern["pattern"],
                 common_pattern["explanation"],
                 common_pattern["examples"]
             )
-            print("\nFound in common patterns database!")
-
-            if test_string:
-                self._test_pattern(common_pattern["pattern"], test_string)
-            return
+            return True, result, None
 
         prompt = self._build_prompt(description)
 
@@ -37,171 +369,237 @@ class RegexAI:
             print("=" * 50)
             print(prompt)
             print("=" * 50)
-            return
+            return True, None, prompt
 
-        print(f"Generating regex for: {description}")
+        cached = _load_cached_result(prompt) if self.use_cache else None
+        if cached:
+            if display:
+                pattern, explanation, examples = cached
+                self._display_result(pattern, explanation, examples)
+                print("\nLoaded from cache!")
 
-        try:
-            response = openai.chat.completions.create(
-                model="gpt-4",
-                messages=[{"role" : "user", "content" : prompt}],
-                max_tokens=400,
-                temperature=0.2
-            )
+                if test_string:
+                    self._test_pattern(pattern, test_string)
 
-            result = response.choices[0].message.content.strip()
-            pattern, explanation, examples = self._parse_response(result)
+                if explain:
+                    self._explain_pattern(pattern)
+            return True, cached, prompt
+
+        return False, None, prompt
 
+    def _on_stream_delta(self, text, pattern, delta, test_string, display):
+        """Add streamed text, showing (and testing) the pattern as soon as its line arrives"""
+        text += delta
+        if display and not pattern and "\n" in delta:
+            pattern = self._parse_response(text[:text.rfind("\n")])[0]
             if pattern:
-                self._display_result(pattern, explanation, examples)
+                self._display_pattern(pattern)
+                if test_string:
+                    self._test_pattern(pattern, test_string)
+        return text, pattern
 
+    def _finish_stream(self, prompt, text, pattern, test_string, explain, display):
+        """Parse the complete streamed reply, cache it and display what is still unshown"""
+        final_pattern, explanation, examples = self._parse_response(text.strip())
+
+        if not pattern and final_pattern:
+            pattern = final_pattern
+            if display:
+                self._display_pattern(pattern)
                 if test_string:
                     self._test_pattern(pattern, test_string)
 
-                if explain:
-                    self._explain_pattern(pattern)
+        if not pattern:
+            if display:
+                print("Failed to generate valid regex pattern")
+            return None
+
+        _store_cached_result(prompt, pattern, explanation, examples)
+        if display:
+            self._display_details(explanation, examples)
+
+            if explain:
+                self._explain_pattern(pattern)
+        return pattern, explanation, examples
+
+    def generate_many(self, descriptions, test_string=None, explain=False):
+        """Generate regex patterns for several descriptions with batched requests"""
+        results = [None] * len(descriptions)
+        pending = []
+        first_index = {}
+
+        for i, description in enumerate(descriptions):
+            # Repeated descriptions are looked up and requested only once
+            if description in first_index:
+                continue
+            first_index[description] = i
+
+            common_pattern = self._check_common_patterns(description.lower())
+            if common_pattern:
+                results[i] = (
+                    common_pattern["pattern"],
+                    common_pattern["explanation"],
+                    common_pattern["examples"]
+                )
             else:
+                if self.use_cache:
+                    results[i] = _load_cached_result(self._build_prompt(description))
+                if not results[i]:
+                    pending.append(i)
+
+        for start in range(0, len(pending), _BATCH_SIZE):
+            batch = pending[start:start + _BATCH_SIZE]
+            prompt = self._build_batch_prompt([descriptions[i] for i in batch])
+            print(f"Generating {len(batch)} regexes in one request")
+
+            try:
+                result = self._complete(prompt, max_tokens=400 * len(batch)).strip()
+                for i, parsed in zip(batch, self._parse_batch_response(result, len(batch))):
+                    results[i] = parsed
+                    if parsed and parsed[0]:
+                        _store_cached_result(self._build_prompt(descriptions[i]), *parsed)
+            except Exception as e:
+                print(f"Error generating regex: {e}")
+
+        results = [results[first_index[description]] for description in descriptions]
+        self._display_results(descriptions, results, test_string, explain)
+        return results
+
+    def _display_results(self, descriptions, results, test_string=None, explain=False):
+        """Display batch results in input order, each under its description"""
+        for description, result in zip(descriptions, results):
+            print(f"\nRegex for: {description}")
+            if not result or not result[0]:
                 print("Failed to generate valid regex pattern")
-        except Exception as e:
-            print(f"Error generating regex: {e}")
+                continue
 
-    def _check_common_patterns(self, description):
-        """Check if description matches common patterns"""
-        common_patterns = {
-            "email" : {
-                "pattern" : r"^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$",
-                "explanation" : "Matches standard email addresses with alphanumeric characters, dots, underscores, plus signs and hyphens.",
-                "examples" : ["user@example.com", "test.email+tag@domain.co.uk", "simple@test.org"]
-            },
-            "phone" : {
-                "pattern" : r"^\+?[1-9]\d{1, 14}$",
-                "explanation" : "Matches international phone numbers with optional plus sign and 2-15 digits.",
-                "examples" : ["+1234567890", "1234567890", "+441234567890"]
-            },
-            "url" : {
-                "pattern" : r"^https?://[^\s]+$",
-                "explanation" : "Matches HTTP and HTTPS URLs.",
-                "examples" : ["https://example.com", "http://test.org/path", "https://sub.domain.com/page?query=value"]
-            },
-            "ip" : {
-                "pattern" : r"^(?:[0-9]{1, 3}\.){3}[0-9]{1, 3}$",
-                "explanation" : "Matches IPv4 addresses (basic format validation).",
-                "examples" : ["192.168.1.1", "10.0.0.1", "172.16.254.1"]
-            },
-            "date" : {
-                "pattern" : r"^(0[1-9]|1[0-2])/(0[1-9]|[12][0-9]|3[01])/\d{4}$",
-                "explanation" : "Matches dates in MM/DD/YYYY format.",
-                "examples" : ["01/15/2024", "12/31/2023", "06/08/1990"]
-            }
-        }
-        desc_lower = description.lower()
-        for key, pattern_info in common_patterns.items():
-            if key in desc_lower or any(variant in desc_lower for variant in [
-                f"{key} address", f"{key} addresses", f"{key} number", f"{key} numbers"
-            ]):
+            pattern, explanation, examples = result
+            self._display_result(pattern, explanation, examples)
+
+            if test_string:
+                self._test_pattern(pattern, test_string)
+
+            if explain:
+                self._explain_pattern(pattern)
+
+    def _check_common_patterns(self, desc_lower):
+        """Check if a lowercased description matches common patterns"""
+        matched = {_TRIGGER_KEYS[m.group(1)] for m in _TRIGGER_RE.finditer(desc_lower)}
+        if not matched:
+            return None
+
+        for key, pattern_info in _COMMON_PATTERNS.items():
+            if key in matched:
                 return pattern_info
 
         return None
 
     def _build_prompt(self, description):
         """Build optimized prompt for AI"""
-        return f"""You are a regex expert. Generate a precise, production-ready regular expression for: "{description}"
-Requirements:
-- Must be accurate and handle common edge cases
-- Should be efficient (avoid catastrophic backtracking)
-- Use standard regex syntax that works across languages
-- Focus on practical, real-world usage
-
-Respond in this EXACT format:
-PATTERN: [the regex pattern only]
-EXPLANATION: [clear explanation of what it matches]
-EXAMPLES: [3-5 realistic examples separated by |]
-
-Common reference patterns:
-- Email: ^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\\.[a-zA-Z]{{2,}}$
-- Phone: ^\\+?[1-9]\\d{{1,14}}$
-- URL: ^https?:\\/\\/[^\\s]+$
-- IPv4: ^(?:[0-9]{{1,3}}\\.){{3}}[0-9]{{1,3}}$
-- Date (MM/DD/YYYY): ^(0[1-9]|1[0-2])\\/(0[1-9]|[12][0-9]|3[01])\\/\\d{{4}}$
-
-Generate for: {description}"""
+        return f"{_PROMPT_HEAD}{description}{_PROMPT_MID}{description}"
+
+    def _build_batch_prompt(self, descriptions):
+        """Build a single prompt covering several descriptions"""
+        numbered = "\n".join(f"{i}. {description}" for i, description in enumerate(descriptions))
+        return f"{_BATCH_PROMPT_HEAD}{numbered}"
+
+    def _parse_batch_response(self, result, count):
+        """Parse a JSON array response into one component tuple per description"""
+        parsed = [None] * count
+        items = json.loads(result[result.find("["):result.rfind("]") + 1])
+
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index")
+            # bool is an int subclass, but true/false are not valid indices
+            if isinstance(index, int) and not isinstance(index, bool) and 0 <= index < count:
+                examples = item.get("examples") or []
+                if isinstance(examples, str):
+                    examples = examples.split("|")
+                elif not isinstance(examples, list):
+                    examples = [examples]
+                parsed[index] = (
+                    str(item.get("pattern") or "").strip(),
+                    str(item.get("explanation") or "").strip(),
+                    list(filter(None, (str(ex).strip() for ex in examples if ex is not None)))
+                )
+
+        return parsed
 
     def _parse_response(self, result):
         """Parse AI response into components"""
-        lines = result.split("\n")
-        pattern = ""
-        explanation = ""
-        examples = []
-
-        for line in lines:
-            line = line.strip()
-            if line.startswith("PATTERN:"):
-                pattern = line.replace("PATTERN:", "").strip()
-            elif line.startswith("EXPLANATION:"):
-                explanation = line.replace("EXPLANATION:", "").strip()
-            elif line.startswith("EXAMPLES:"):
-                examples_text = line.replace("EXAMPLES:", "").strip()
-                examples = [ex.strip() for ex in examples_text.split("|") if ex.strip()]
+        fields = {"PATTERN" : "", "EXPLANATION" : "", "EXAMPLES" : ""}
+        for m in _RESPONSE_RE.finditer(result):
+            fields[m.group(1)] = m.group(2)
 
-        return pattern, explanation, examples
+        examples = list(filter(None, (ex.strip() for ex in fields["EXAMPLES"].split("|"))))
+        return fields["PATTERN"], fields["EXPLANATION"], examples
 
     def _display_result(self, pattern, explanation, examples):
         """Display the generated regex result"""
-        print(f"\nGenerated Regex:")
-        print(f"   {pattern}")
+        _write(self._pattern_lines(pattern) + self._details_lines(explanation, examples))
+
+    def _display_pattern(self, pattern):
+        """Display the generated regex pattern"""
+        _write(self._pattern_lines(pattern))
 
+    def _display_details(self, explanation, examples):
+        """Display the explanation and example matches of a regex"""
+        _write(self._details_lines(explanation, examples))
+
+    def _pattern_lines(self, pattern):
+        """Format the generated regex pattern as output lines"""
+        return ["", "Generated Regex:", f"   {pattern}"]
+
+    def _details_lines(self, explanation, examples):
+        """Format the explanation and example matches as output lines"""
+        lines = []
         if explanation:
-            print(f"\nExplanation:")
-            print(f"   {explanation}")
+            lines += ["", "Explanation:", f"   {explanation}"]
 
         if examples:
-            print(f"\nExample matches:")
-            for example in examples:
-                print(f"   - {example}")
+            lines += ["", "Example matches:"]
+            lines += [f"   - {example}" for example in examples]
+
+        return lines
 
     def _test_pattern(self, pattern, test_string):
-        """Test the pattern against a string"""
-        print(f"\nTesting: '{test_string}'")
+        """Test the pattern (string or compiled) against a string"""
+        lines = ["", f"Testing: '{test_string}'"]
 
         try:
-            match = re.search(pattern, test_string)
+            if not isinstance(pattern, re.Pattern):
+                pattern = _compile(pattern, _PATTERN_FLAGS.get(pattern, 0))
+            match = pattern.search(test_string)
             if match:
-                print("    Match found!")
+                lines.append("    Match found!")
                 if match.groups():
-                    print(f"    Captured groups: {match.groups()}")
-                print(f"    Matched text: '{match.group()}'")
+                    lines.append(f"    Captured groups: {match.groups()}")
+                lines.append(f"    Matched text: '{match.group()}'")
             else:
-                print("    No match found")
+                lines.append("    No match found")
         except re.error as e:
-            print(f"     Invalid regex pattern: {e}")
+            lines.append(f"     Invalid regex pattern: {e}")
+
+        _write(lines)
 
     def _explain_pattern(self, pattern):
         """Provide detailed explanation of regex components"""
-        print(f"\nPattern Breakdown:")
-        print(f"Pattern: {pattern}")
-
-        components = []
-        if "^" in pattern:
-            components.append("^ = Start of string")
-        if "$" in pattern:
-            components.append("$ = End of string")
-        if "+" in pattern:
-            components.append("+ = One or more of preceding element")
-        if "*" in pattern:
-            components.append("* = Zero or more of preceding element")
-        if "?" in pattern:
-            components.append("? = Zero or one of preceding element")
-        if "[" in pattern and "]" in pattern:
-            components.append("[] = Characters class (match any character inside)")
-        if "\\d" in pattern:
-            components.append("\\d = Any digit (0-9)")
-        if "\\w" in pattern:
-            components.append("\\w = Any word character (a-z, A-Z, 0-9, _)")
-        if "\\s" in pattern:
-            components.append("\\s = Any whitespace character")
-
-        for component in components:
-            print(f"   - {component}")
+        seen = 0
+        escaped = False
+        for ch in pattern:
+            if escaped:
+                seen |= _ESCAPE_FEATURE_BITS.get(ch, 0)
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            else:
+                seen |= _FEATURE_BITS.get(ch, 0)
+
+        lines = ["", "Pattern Breakdown:", f"Pattern: {pattern}"]
+        lines += [f"   - {text}" for i, (_, text) in enumerate(_FEATURES) if seen & (1 << i)]
+        _write(lines)
 
 def main():
     parser = argparse.ArgumentParser(
@@ -226,6 +624,7 @@ Common patterns:
     parser.add_argument("--test", "-t", help="Test string to validate the regex against")
     parser.add_argument("--dry-run", "-d", action="store_true", help="Show the AI prompt without making a request")
     parser.add_argument("--explain", "-e", action="store_true", help="Explain the regex pattern components")
+    parser.add_argument("--no-cache", action="store_true", help="Ask the AI again instead of reusing a cached answer")
     parser.add_argument("--version", "-v", action="version", version="RegexAI 1.0.0")
 
     args = parser.parse_args()
@@ -233,8 +632,8 @@ Common patterns:
     print("RegexAI - English to Regex Generator")
     print("=" * 40)
 
-    regexai = RegexAI()
-    regexai.generate(args.description, args.test, args.dry_run, args.explain)
+    with RegexAI(use_cache=not args.no_cache) as regexai:
+        regexai.generate(args.description, args.test, args.dry_run, args.explain)
 
 if __name__ == "__main__":
     main()
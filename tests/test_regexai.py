@@ -0,0 +1,243 @@
+import asyncio
+import json
+import re
+
+import httpx
+import pytest
+
+import regexai
+from regexai import RegexAI, _sse_delta
+
+
+@pytest.fixture
+def ai(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("OPENAI_API_KEY", "test-key")
+    monkeypatch.setattr(regexai, "_CACHE_DIR", str(tmp_path / "cache"))
+    with RegexAI() as instance:
+        yield instance
+
+
+def _use_transport(ai, handler):
+    ai.client = httpx.Client(transport=httpx.MockTransport(handler), headers=ai._headers())
+
+
+def _sse(*events):
+    return "".join(f"data: {event}\n\n" for event in events).encode()
+
+
+def _chunk(content):
+    return json.dumps({"choices" : [{"delta" : {"content" : content}}]})
+
+
+STREAM_BODY = _sse(
+    json.dumps({"choices" : [{"delta" : {"role" : "assistant"}}]}),
+    _chunk("PATTERN: ^a+$\n"),
+    json.dumps({"choices" : []}),
+    json.dumps({"choices" : [{"delta" : None}]}),
+    _chunk("EXAMPLES: a | aa"),
+    "[DONE]",
+)
+
+
+@pytest.mark.parametrize("line, expected", [
+    (f"data: {_chunk('abc')}", "abc"),
+    (f"data:{_chunk('abc')}", "abc"),
+    ("data: [DONE]", ""),
+    ('data: {"choices": []}', ""),
+    ('data: {"choices": [{"delta": null}]}', ""),
+    ('data: {"choices": [{"delta": {"content": null}}]}', ""),
+    (": keep-alive", ""),
+    ("event: message", ""),
+    ("", ""),
+])
+def test_sse_delta_framing(line, expected):
+    assert _sse_delta(line) == expected
+
+
+def test_stream_complete_yields_content_only(ai):
+    _use_transport(ai, lambda request: httpx.Response(200, content=STREAM_BODY))
+
+    assert list(ai._stream_complete("prompt")) == ["PATTERN: ^a+$\n", "EXAMPLES: a | aa"]
+
+
+def test_stream_complete_async_yields_content_only(ai):
+    transport = httpx.MockTransport(lambda request: httpx.Response(200, content=STREAM_BODY))
+
+    async def collect():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [delta async for delta in ai._stream_complete_async("prompt", client=client)]
+
+    assert asyncio.run(collect()) == ["PATTERN: ^a+$\n", "EXAMPLES: a | aa"]
+
+
+def test_stream_request_body(ai):
+    seen = {}
+
+    def handler(request):
+        seen.update(json.loads(request.content))
+        seen["auth"] = request.headers["Authorization"]
+        return httpx.Response(200, content=_sse("[DONE]"))
+
+    _use_transport(ai, handler)
+    list(ai._stream_complete("prompt"))
+
+    assert seen["stream"] is True
+    assert seen["messages"] == [{"role" : "user", "content" : "prompt"}]
+    assert seen["auth"] == "Bearer test-key"
+
+
+API_ERROR = {"error" : {"message" : "Incorrect API key provided", "type" : "invalid_request_error"}}
+
+
+def test_complete_raises_api_error_message(ai):
+    _use_transport(ai, lambda request: httpx.Response(401, json=API_ERROR))
+
+    with pytest.raises(RuntimeError, match=r"\(401\): Incorrect API key provided"):
+        ai._complete("prompt")
+
+
+def test_stream_complete_raises_api_error_message(ai):
+    _use_transport(ai, lambda request: httpx.Response(401, json=API_ERROR))
+
+    with pytest.raises(RuntimeError, match="Incorrect API key provided"):
+        list(ai._stream_complete("prompt"))
+
+
+def test_stream_complete_async_raises_api_error_message(ai):
+    transport = httpx.MockTransport(lambda request: httpx.Response(429, json=API_ERROR))
+
+    async def collect():
+        async with httpx.AsyncClient(transport=transport) as client:
+            return [delta async for delta in ai._stream_complete_async("prompt", client=client)]
+
+    with pytest.raises(RuntimeError, match=r"\(429\): Incorrect API key provided"):
+        asyncio.run(collect())
+
+
+@pytest.mark.parametrize("body", [b"Bad Gateway", b'{"detail": "nope"}', b'{"error": "nope"}'])
+def test_api_error_without_message_falls_back_to_status(ai, body):
+    _use_transport(ai, lambda request: httpx.Response(502, content=body))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        ai._complete("prompt")
+
+
+def test_generate_reports_api_error(ai, capsys):
+    _use_transport(ai, lambda request: httpx.Response(401, json=API_ERROR))
+
+    assert ai.generate("hexadecimal colors") is None
+    assert "Incorrect API key provided" in capsys.readouterr().out
+
+
+def test_parse_batch_response_skips_bad_items(ai):
+    reply = """Here you go:
+```json
+[
+  "not an object",
+  42,
+  null,
+  {"index": 0, "pattern": "^a$", "explanation": "a", "examples": ["a", null, " ", 7]},
+  {"index": true, "pattern": "^bool$"},
+  {"index": 5, "pattern": "^out$"},
+  {"index": -1, "pattern": "^neg$"},
+  {"index": "1", "pattern": "^str$"},
+  {"index": 2, "pattern": null, "explanation": null, "examples": null}
+]
+```"""
+
+    assert ai._parse_batch_response(reply, 3) == [
+        ("^a$", "a", ["a", "7"]),
+        None,
+        ("", "", []),
+    ]
+
+
+def test_parse_batch_response_splits_string_examples(ai):
+    reply = '[{"index": 0, "pattern": "^x$", "examples": "x | xx ||xxx"}]'
+
+    assert ai._parse_batch_response(reply, 1) == [("^x$", "", ["x", "xx", "xxx"])]
+
+
+def test_generate_many_keeps_good_items_from_a_bad_batch(ai):
+    content = json.dumps([
+        {"index" : 0, "pattern" : "^#[0-9a-f]{6}$", "examples" : "#ffffff|#000000"},
+        "garbage",
+        {"index" : 1, "pattern" : None},
+    ])
+    _use_transport(ai, lambda request: httpx.Response(
+        200, json={"choices" : [{"message" : {"content" : content}}]}
+    ))
+
+    results = ai.generate_many(["hex colors", "roman numerals"])
+
+    assert results == [("^#[0-9a-f]{6}$", "", ["#ffffff", "#000000"]), ("", "", [])]
+
+
+def test_parse_response_ignores_preamble_and_field_order(ai):
+    reply = (
+        "Sure! Here is a regex for that.\r\n"
+        "EXAMPLES: 1 | 22 | \r\n"
+        "  EXPLANATION:  One or more digits  \r\n"
+        "\r\n"
+        "PATTERN: ^\\d+$\r\n"
+        "Let me know if you need anything else."
+    )
+
+    assert ai._parse_response(reply) == ("^\\d+$", "One or more digits", ["1", "22"])
+
+
+def test_parse_response_empty_pattern_line(ai):
+    assert ai._parse_response("PATTERN:\nEXPLANATION: nothing") == ("", "nothing", [])
+
+
+def test_parse_response_without_fields(ai):
+    assert ai._parse_response("I can't help with that.") == ("", "", [])
+
+
+def test_stream_shows_pattern_only_once_its_line_is_complete(ai, capsys):
+    text = pattern = ""
+    for delta in ["Here:\nPATTERN: ^a", "b+"]:
+        text, pattern = ai._on_stream_delta(text, pattern, delta, None, True)
+    # The buffer stops before the newline, so "^ab+" may still be incomplete
+    assert pattern == ""
+    assert capsys.readouterr().out == ""
+
+    text, pattern = ai._on_stream_delta(text, pattern, "c$\nEXPLANATION: a", None, True)
+    assert pattern == "^ab+c$"
+    assert "^ab+c$" in capsys.readouterr().out
+
+
+def test_stream_skips_empty_pattern_line(ai):
+    text = pattern = ""
+    text, pattern = ai._on_stream_delta(text, pattern, "PATTERN:\nEXPLANATION: tbd\n", None, True)
+    assert pattern == ""
+
+    text, pattern = ai._on_stream_delta(text, pattern, "PATTERN: ^z$\n", None, True)
+    assert pattern == "^z$"
+
+
+@pytest.mark.parametrize("run", [
+    lambda ai, test: ai.generate("phone", test_string=test),
+    lambda ai, test: ai.generate_many(["phone"], test_string=test),
+    lambda ai, test: asyncio.run(ai.generate_all(["phone"], test_string=test)),
+])
+def test_builtin_patterns_match_ascii_only_from_every_entry_point(ai, capsys, run):
+    # Arabic-Indic digits are \d in Unicode mode but not under re.ASCII
+    run(ai, "+1٢٣٤٥٦")
+
+    out = capsys.readouterr().out
+    assert "No match found" in out
+    assert "Match found!" not in out
+
+
+def test_builtin_pattern_strings_hit_the_warmed_compile_cache(ai):
+    pattern = regexai._COMMON_PATTERNS["email"]["pattern"]
+    before = regexai._compile.cache_info()
+
+    ai._test_pattern(pattern, "user@example.com")
+
+    after = regexai._compile.cache_info()
+    assert after.hits == before.hits + 1
+    assert after.misses == before.misses
+    assert regexai._compile(pattern, re.ASCII) is regexai._COMMON_PATTERNS["email"]["compiled"]